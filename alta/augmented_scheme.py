@@ -30,96 +30,167 @@ https://www.semanticscholar.org/paper/Authenticating-Streamed-Data-in-the-Presen
 
 from .scheme import Scheme
 
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+__all__ = [ 'AugmentedScheme' ]
+
 # FIXME: This stuff needs to deal with rollover
 class AugmentedPeriod:
-    """The augmented period."""
+    """The augmented period. Nodes are identified by their order of creation,
+    and are stored as parallel lists of predecessors and outgoing edges indexed
+    by node id.
+    """
     def __init__(self):
         """Initialize to a two-node graph."""
-        A = { 'edges': [], 'pred': None }
-        self.B = { 'edges': [], 'pred': A }
-        self.next_insert = self.B
-        self.nodect = 2
+        # Node 0 is the head and node 1 the tail; -1 denotes no predecessor.
+        self.preds = [ -1, 0 ]
+        self.edges = [ (), () ]
+        self.next_insert = 1
 
     def augment(self):
         """Augment the interval by inserting a pair of new nodes into the graph."""
-        n1 = { 'edges': [ self.next_insert['pred'], self.next_insert ], 'pred': self.next_insert['pred'] }
-        n2 = { 'edges': [ n1, self.next_insert ], 'pred': n1 }
-        self.next_insert['pred'] = n2
+        preds = self.preds
+        n1 = len(preds)
+        preds.append(preds[self.next_insert])
+        self.edges.append((preds[self.next_insert], self.next_insert))
+        n2 = n1 + 1
+        preds.append(n1)
+        self.edges.append((n1, self.next_insert))
+        preds[self.next_insert] = n2
         self.next_insert = n2
-        self.nodect += 2
 
     def _flatten(self):
-        """Flatten the graph into a list."""
-        n = self.B
-        idx = self.nodect - 1
-        self.seq = []
-        while n is not None:
-            n['idx'] = idx
-            self.seq.insert(0, n)
+        """Flatten the graph into a list of node ids, recording the position of
+        each node in idx.
+        """
+        preds = self.preds
+        pos = [ 0 ] * len(preds)
+        seq = []
+        n = 1
+        idx = len(preds) - 1
+        while n != -1:
+            pos[n] = idx
+            seq.append(n)
             idx -= 1
-            n = n['pred']
+            n = preds[n]
+        seq.reverse()
+        self.idx = pos
+        self.seq = seq
 
     def doffsets(self):
         """Return the relative index offsets for the destination of each edge in the graph."""
         self._flatten()
+        idx = self.idx
+        edges = self.edges
         for n in self.seq[1:len(self.seq)-1]:
-            yield sorted([ d['idx'] - n['idx'] for d in n['edges'] ])
+            d1, d2 = edges[n]
+            o1 = idx[d1] - idx[n]
+            o2 = idx[d2] - idx[n]
+            yield [ o1, o2 ] if o1 <= o2 else [ o2, o1 ]
         return
 
+def _construct_doffsets(a, p):
+    """Compute destination offsets as specified in the paper."""
+    # This doesn't get done often, so no sense making it hard to follow.
+    # This follows the construction presented in the paper very closely.
+    doffsets = []
+    if p == 1:
+        doffsets.append([1, a])
+    elif p == 2:
+        doffsets.append([2, 2*a])
+        doffsets.append([-1, 1])
+    elif p >= 3 and p % 2 == 1:
+        ap = AugmentedPeriod()
+        for i in range((p - 1) // 2):
+            ap.augment()
+        doffsets.append([p, p*a])
+        doffsets.extend(ap.doffsets())
+    else:
+        raise ValueError()
+    return doffsets
+
+def _compute_soffsets(doffsets, p):
+    """Conceptually invert doffsets, resulting in the list of offsets to
+    nodes whose hashes a given node needs to contain.
+    """
+    soffsets = [ [] for i in doffsets ]
+    for idx,dofs in enumerate(doffsets):
+        for o in dofs:
+            soffsets[(idx + o) % p].append(-o)
+    return soffsets
+
+@lru_cache(maxsize=None)
+def _build_offsets(a, p):
+    """Return a tuple (doffsets, soffsets) for the given arguments a and p.
+    The result depends only on its arguments, so it is cached and shared (as
+    tuples of tuples) by all schemes constructed with the same parameters.
+    Each tuple of offsets is sorted, so sources need not sort its result and
+    bounds can be applied by bisection.
+    """
+    doffsets = _construct_doffsets(a, p)
+    soffsets = _compute_soffsets(doffsets, p)
+    return tuple(tuple(sorted(d)) for d in doffsets), tuple(tuple(sorted(s)) for s in soffsets)
+
+def _offset_indices(index, offs, first, last):
+    """Return the list of index + o for each o in the sorted offsets offs,
+    eliminating any resulting indices outside of the range given by first and
+    last (if specified).
+    """
+    # Most calls are either unbounded or for an index far enough from the
+    # bounds that nothing is eliminated, which the sorted end offsets reveal
+    # directly. Otherwise, the bounds select a contiguous slice of offs.
+    if not offs or ((first is None or index + offs[0] >= first) and (last is None or index + offs[-1] <= last)):
+        return [ index + o for o in offs ]
+    lo = 0 if first is None else bisect_left(offs, first - index)
+    hi = len(offs) if last is None else bisect_right(offs, last - index)
+    return [ index + o for o in offs[lo:hi] ]
+
 class AugmentedScheme(Scheme):
     """The augmented scheme for packet hash source/destination offsets."""
+    __slots__ = ('a', 'p', '_doffsets', '_soffsets', '_p_mask')
+
     def __init__(self, a, p=1):
         """Compute the offsets according to the specified arguments a and p, as
         specified in the source paper.
         """
         self.a = a # strength
         self.p = p # period
-        self._construct_doffsets()
-        self._compute_soffsets()
-
-    def _construct_doffsets(self):
-        """Compute destination offsets as specified in the paper."""
-        # This doesn't get done often, so no sense making it hard to follow.
-        # This follows the construction presented in the paper very closely.
-        self.doffsets = []
-        if self.p == 1:
-            self.doffsets.append([1, self.a])
-        elif self.p == 2:
-            self.doffsets.append([2, 2*self.a])
-            self.doffsets.append([-1, 1])
-        elif self.p >= 3 and self.p % 2 == 1:
-            ap = AugmentedPeriod()
-            for i in range((self.p - 1) // 2):
-                ap.augment()
-            self.doffsets.append([self.p, self.p*self.a])
-            self.doffsets.extend(ap.doffsets())
-        else:
-            raise ValueError()
-
-    def _compute_soffsets(self):
-        """Conceptually invert doffsets, resulting in the list of offsets to
-        nodes whose hashes a given node needs to contain.
+        self._doffsets, self._soffsets = _build_offsets(a, p)
+        # When p is a power of two, index % p reduces to a mask.
+        self._p_mask = p - 1 if p & (p - 1) == 0 else None
+
+    @property
+    def doffsets(self):
+        """Return the destination offsets, indexed by node index modulo p.
+        This is an immutable tuple of tuples shared by all schemes with the same
+        a and p.
+        """
+        return self._doffsets
+
+    @property
+    def soffsets(self):
+        """Return the sorted source offsets, indexed by node index modulo p.
+        This is an immutable tuple of tuples shared by all schemes with the same
+        a and p.
         """
-        self.soffsets = [ [] for i in self.doffsets ]
-        for idx,dofs in enumerate(self.doffsets):
-            for o in dofs:
-                self.soffsets[(idx + o) % self.p].append(-o)
+        return self._soffsets
 
     def sources(self, index, first=None, last=None):
         """Given a node index, return the list of indices of nodes from which
         hashes must be drawn. If first or last is specified, eliminate any node
         indices outside of that range.
         """
-        return sorted([ index + o for o in self.soffsets[index % self.p]
-            if (first is None or index+o >= first) and (last is None or index+o <= last) ])
+        i = index & self._p_mask if self._p_mask is not None else index % self.p
+        return _offset_indices(index, self._soffsets[i], first, last)
 
     def destinations(self, index, first=None, last=None):
         """Given a node index, return the list of indices of nodes into which
         its hash must be placed. If first or last is specified, eliminate any node
         indices outside of that range.
         """
-        return [ index + o for o in self.doffsets[index % self.p]
-                if (first is None or index+o >= first) and (last is None or index+o <= last) ]
+        i = index & self._p_mask if self._p_mask is not None else index % self.p
+        return _offset_indices(index, self._doffsets[i], first, last)
 
     def is_ready(self, want_send_index, latest_index):
         """True if all payload hashes required to fully construct the payload
@@ -26,17 +26,48 @@
 deserialize ALTA authentication tags. It provides a """
 
 from abc import abstractmethod, ABCMeta
+from bisect import insort
 from functools import lru_cache
+from itertools import chain
 import struct
 
 class OverwriteHashError(RuntimeError): pass
 
+@lru_cache(maxsize=None)
+def _hash_entries_struct(hash_size, hash_count):
+    """Return the compiled struct for hash_count (offset, hash) pairs. The
+    hash count occupies three bits of the options octet, so there are at most
+    eight entries per hash size.
+    """
+    return struct.Struct('>' + ('b%ds' % hash_size) * hash_count)
+
+@lru_cache(maxsize=None)
+def _compiled_struct(fmt):
+    """Return the compiled struct for the given format."""
+    return struct.Struct(fmt)
+
+@lru_cache(maxsize=None)
+def _hash_size(hash_cls):
+    """Return the digest size in octets of the given hash class: its
+    hash_size attribute if it has one, or else the length of a digest.
+    """
+    return getattr(hash_cls, 'hash_size', None) or len(hash_cls().digest())
+
+@lru_cache(maxsize=None)
+def _zero_bytes(n):
+    """Return n zero octets, shared across callers as bytes is immutable."""
+    return bytes(n)
+
 class AuthTagOptions:
     """The ALTA authentication tag options octet."""
+    __slots__ = ('_hash_count', '_signature_present', '_sig_bit', '_cached')
+
     def __init__(self, hash_count=0, signature_present=False):
         """Initialize the options with the given arguments."""
         self._hash_count = hash_count
         self._signature_present = signature_present
+        self._sig_bit = 0x10 if signature_present else 0
+        self._cached = None
 
     @property
     def hash_count(self):
@@ -52,6 +83,7 @@ class AuthTagOptions:
         match the number of hashes in the enclosing authentication tag.
         """
         self._hash_count = value
+        self._cached = None
 
     @property
     def signature_present(self):
@@ -65,6 +97,8 @@ class AuthTagOptions:
         authentication tag.
         """
         self._signature_present = value
+        self._sig_bit = 0x10 if value else 0
+        self._cached = None
 
     @property
     def max_len(self):
@@ -72,17 +106,26 @@ class AuthTagOptions:
         return 1
 
     def to_str(self):
-        """Serialize the options octet."""
-        return struct.pack('>B', (self.hash_count << 5) | (int(self.signature_present) << 4))
+        """Serialize the options octet. The result is cached until the options
+        are next modified.
+        """
+        if self._cached is None:
+            self._cached = bytes(((self._hash_count << 5) | self._sig_bit,))
+        return self._cached
 
     @classmethod
     def from_str(cls, value):
         """Deserialize an options octet into a class instance."""
-        opt_int, = struct.unpack_from('>B', value)
+        opt_int = value[0]
         return cls(opt_int >> 5, (opt_int & 0x10) != 0), 1
 
 class AuthTag(metaclass=ABCMeta):
     """The ALTA authentication tag interface and partial implementation."""
+    __slots__ = ('_options', '_hash_cls', '_hash_size', '_signature',
+            '_signature_key', '_signature_len', '_zero_signature', '_hashes',
+            '_hash_indices', '_chained_hashes_cache', '_signature_ofs_cache',
+            '_to_str_cache')
+
     def __init__(self, hash_cls, signature_key, options=None):
         """Initialize an authentication tag with the given parameters.
 
@@ -91,7 +134,9 @@ class AuthTag(metaclass=ABCMeta):
 
         Keyword arguments:
         hash_cls -- A duck-typed hash class with an interface matching the
-            fixed-length hashes from module hashlib.
+            fixed-length hashes from module hashlib. If it has a hash_size
+            class attribute (as TruncatedHash types do), that is taken as the
+            digest size; otherwise the size is measured once per class.
         signature_key -- A signing or verification key instance of a duck-typed
             class matching nacl.SigningKey or nacl.VerifyKey, but with an added
             instance attribute signature_len denoting the fixed length of the
@@ -103,12 +148,19 @@ class AuthTag(metaclass=ABCMeta):
         else:
             self._options = options
         self._hash_cls = hash_cls
-        if not hasattr(hash_cls, 'hash_size'):
-            tmp_hash = hash_cls()
-            hash_cls.hash_size = len(tmp_hash.digest())
+        self._hash_size = _hash_size(hash_cls)
         self._signature = None
         self._signature_key = signature_key
+        self._signature_len = signature_key.signature_len if signature_key else 0
+        self._zero_signature = _zero_bytes(self._signature_len)
+        # Hashes are keyed by source index rather than stored in fixed slots:
+        # the tag does not know the scheme, and the serialized form carries an
+        # explicit offset per hash.
         self._hashes = {}
+        self._hash_indices = []
+        self._chained_hashes_cache = None
+        self._signature_ofs_cache = None
+        self._to_str_cache = None
 
     def chain_payload_hash(self, src_index, src_hash):
         """Add the given src_hash to the set of hashes in this authentication
@@ -117,15 +169,44 @@ class AuthTag(metaclass=ABCMeta):
         if src_index in self._hashes:
             raise OverwriteHashError()
         self._hashes[src_index] = src_hash
+        insort(self._hash_indices, src_index)
+        self._hashes_changed()
+
+    def chain_payload_hashes(self, pairs):
+        """Add the hash for each (source index, source hash) tuple in the given
+        sequence to the set of hashes in this authentication tag. No hash is
+        added if any source index is repeated or already present.
+        """
+        new_hashes = dict(pairs)
+        if len(new_hashes) != len(pairs) or not self._hashes.keys().isdisjoint(new_hashes):
+            raise OverwriteHashError()
+        self._hashes.update(new_hashes)
+        self._hash_indices = sorted(self._hashes)
+        self._hashes_changed()
+
+    def _hashes_changed(self):
+        """Update the options and drop cached values after the set of chained
+        hashes changes.
+        """
         self._options.hash_count = self.hash_count
+        self._chained_hashes_cache = None
+        self._signature_ofs_cache = None
+        self._to_str_cache = None
 
     @property
     def chained_hashes(self):
-        """Generate a (source index, source hash) tuple for each chained hash
-        in order of increasing source index.
+        """Return an iterator over a (source index, source hash) tuple for each
+        chained hash in order of increasing source index.
+        """
+        if self._chained_hashes_cache is None:
+            self._chained_hashes_cache = [ (src_index, self._hashes[src_index]) for src_index in self._hash_indices ]
+        return iter(self._chained_hashes_cache)
+
+    def __contains__(self, src_index):
+        """True iff a hash for the given source index is chained into this
+        authentication tag.
         """
-        for src_index in sorted(self._hashes.keys()):
-            yield (src_index, self._hashes[src_index])
+        return src_index in self._hashes
 
     def get_chained_hash(self, src_index):
         """Return the hash for a given source index, or None if that source's
@@ -148,7 +229,7 @@ class AuthTag(metaclass=ABCMeta):
         """Return the size of the hash employed by this authentication tag, in
         octets.
         """
-        return self.hash_cls.hash_size
+        return self._hash_size
 
     @property
     def options(self):
@@ -159,6 +240,8 @@ class AuthTag(metaclass=ABCMeta):
     def options(self, value):
         """Set the options octet class instance to the given value."""
         self._options = value
+        self._signature_ofs_cache = None
+        self._to_str_cache = None
 
     @property
     def signature_key(self):
@@ -189,6 +272,7 @@ class AuthTag(metaclass=ABCMeta):
     def signature(self, value):
         """Set the payload signature to the given value."""
         self._signature = value
+        self._to_str_cache = None
 
     def sign(self, unsigned_payload):
         """Sign the given unsigned serialized payload and overwrite the
@@ -235,6 +319,8 @@ class AuthTagEO(AuthTag):
     extending AuthTag with explicit offsets and a complete serialization
     format.
     """
+    __slots__ = ('_explicit_index_fmt', '_explicit_index_struct', '_explicit_index_len')
+
     def __init__(self, explicit_index_fmt, *args, **kwargs):
         """Initialize an instance with the given arguments.
 
@@ -245,6 +331,12 @@ class AuthTagEO(AuthTag):
         """
         super().__init__(*args, **kwargs)
         self._explicit_index_fmt = explicit_index_fmt
+        if explicit_index_fmt:
+            self._explicit_index_struct = _compiled_struct(explicit_index_fmt)
+            self._explicit_index_len = self._explicit_index_struct.size
+        else:
+            self._explicit_index_struct = None
+            self._explicit_index_len = 0
 
     @property
     def explicit_index_fmt(self):
@@ -255,31 +347,46 @@ class AuthTagEO(AuthTag):
         """Return the maximum length of this authentication tag for the given
         scheme and self.index.
         """
-        return self.options.max_len + self._explicit_index_size() + (1 + self.hash_size) * len(scheme.sources(self.index)) + (int(self.options.signature_present) * self.signature_key.signature_len if self.signature_key else 0)
+        return self.options.max_len + self._explicit_index_size() + (1 + self.hash_size) * len(scheme.sources(self.index)) + int(self.options.signature_present) * self._signature_len
 
     def add_signature(self, unsigned_payload, signature):
         """Overwrite the signature range in the given unsigned payload with
-        the given signature.
+        the given signature. The payload may be bytes or a bytearray; a new
+        bytes instance is returned.
         """
-        return unsigned_payload[0:self._signature_ofs()] + signature + unsigned_payload[self._signature_ofs() + self.signature_key.signature_len:]
+        return self._splice_signature(unsigned_payload, signature)
 
     def strip_signature(self, signed_payload):
-        """Overwrite the signature range in the given payload with zeroes."""
-        return signed_payload[0:self._signature_ofs()] + self._empty_signature() + signed_payload[self._signature_ofs() + self.signature_key.signature_len:]
+        """Overwrite the signature range in the given payload with zeroes. The
+        payload may be bytes or a bytearray; a new bytes instance is returned,
+        as the signature keys accept only bytes.
+        """
+        return self._splice_signature(signed_payload, self._empty_signature())
 
-    @lru_cache(maxsize=100)
     def to_str(self):
         """Serialize this authentication tag. If a signature is specified by
         options as present, the signature range is filled with zeroes, pending
-        signing.
+        signing. The result is cached until the tag is next modified.
         """
-        ret = self.options.to_str()
+        if self._to_str_cache is not None:
+            return self._to_str_cache
+        # The serialized length is known up front, so fill a zeroed buffer in
+        # place rather than concatenating: this also leaves the signature
+        # range zeroed.
+        options = self._options
+        index = self.index
+        sig_len = self._signature_len if options.signature_present else 0
+        buf = bytearray(self._signature_ofs() + sig_len)
+        ofs = options.max_len
+        buf[0:ofs] = options.to_str()
         if self._explicit_index_fmt:
-            ret += struct.pack(self._explicit_index_fmt, self.index)
-        for (src_index, src_hash) in self.chained_hashes:
-            ret += struct.pack('>b%ds' % self.hash_size, src_index - self.index, src_hash)
-        if self.options.signature_present:
-            ret += self._empty_signature()
+            self._explicit_index_struct.pack_into(buf, ofs, index)
+            ofs += self._explicit_index_len
+        hash_entries = _hash_entries_struct(self._hash_size, self.hash_count)
+        hash_entries.pack_into(buf, ofs, *chain.from_iterable(
+            (src_index - index, src_hash) for (src_index, src_hash) in self.chained_hashes))
+        ret = bytes(buf)
+        self._to_str_cache = ret
         return ret
 
     @classmethod
@@ -292,36 +399,47 @@ class AuthTagEO(AuthTag):
         auth_tag = cls(options=options, *args, **kwargs)
 
         if auth_tag.explicit_index_fmt:
-            auth_tag.index, = struct.unpack_from(auth_tag.explicit_index_fmt, value, 1)
-            used += auth_tag._explicit_index_size()
-
-        fmt = '>' + ('b%ds' % (auth_tag.hash_size)) * auth_tag.options.hash_count
-        ofs_hash_pairs = list(struct.unpack_from(fmt, value, used))
-        while ofs_hash_pairs:
-            ofs = int(ofs_hash_pairs.pop(0))
-            src_hash = ofs_hash_pairs.pop(0)
+            auth_tag.index, = auth_tag._explicit_index_struct.unpack_from(value, used)
+            used += auth_tag._explicit_index_len
+
+        hash_entries = _hash_entries_struct(auth_tag.hash_size, auth_tag.options.hash_count)
+        ofs_hash_pairs = iter(hash_entries.unpack_from(value, used))
+        for ofs, src_hash in zip(ofs_hash_pairs, ofs_hash_pairs):
             auth_tag._hashes[ofs + auth_tag.index] = src_hash
+        # Serialized offsets are already in increasing order, so this sort is
+        # linear in practice.
+        auth_tag._hash_indices = sorted(auth_tag._hashes)
         used += (1 + auth_tag.hash_size) * auth_tag.options.hash_count
 
         if auth_tag.options.signature_present:
-            auth_tag.signature, = struct.unpack_from('>%ds' % auth_tag.signature_key.signature_len, value, used)
-            used += auth_tag.signature_key.signature_len
+            sig_len = auth_tag._signature_len
+            auth_tag.signature, = _compiled_struct('>%ds' % sig_len).unpack_from(value, used)
+            used += sig_len
 
         return auth_tag, used
 
     def _empty_signature(self):
         """Return a signature field of all zeroes."""
-        return b'\x00' * self.signature_key.signature_len
+        return self._zero_signature
 
     def _explicit_index_size(self):
         """Return the size of the explicit index."""
-        if self._explicit_index_fmt:
-            return struct.calcsize(self._explicit_index_fmt)
-        else:
-            return 0
+        return self._explicit_index_len
+
+    def _splice_signature(self, payload, signature):
+        """Return a copy of the given payload with the signature range replaced
+        by the given signature. The surrounding ranges are sliced through a
+        memoryview, so the payload is copied exactly once.
+        """
+        ofs = self._signature_ofs()
+        view = memoryview(payload)
+        return b''.join((view[:ofs], signature, view[ofs + self._signature_len:]))
 
     def _signature_ofs(self):
         """Return the offset into the serialized authentication tag of the
-        signature field.
+        signature field. The result is cached until the hashes or options are
+        next modified.
         """
-        return self.options.max_len + self._explicit_index_size() + (1 + self.hash_size) * self.options.hash_count
+        if self._signature_ofs_cache is None:
+            self._signature_ofs_cache = self._options.max_len + self._explicit_index_len + (1 + self._hash_size) * self._options.hash_count
+        return self._signature_ofs_cache
@@ -29,11 +29,16 @@ received payloads and then consume them once authenticated.
 from .auth_tag import AuthTagEO
 from .common import *
 
+from operator import itemgetter
+
 class ConsumerEO:
     """A payload consumer for authentication tags with explicit offsets
     (AuthTagEO). It is scheme-oblivious. Add received payloads with
     push_payload. Once authenticated, they will be generated by payloads_ready.
     """
+    __slots__ = ('_pre_lv_window', '_post_lv_window', '_payloads',
+            '_verified_hashes', '_latest_verified_index')
+
     def __init__(self, pre_lv_window=128, post_lv_window=128):
         """Initialize state with the given arguments. The window must be
         sized to retain sufficient state to authenticate packets with any
@@ -63,46 +68,61 @@ class ConsumerEO:
 
     def payloads_ready(self):
         """Generate payloads that have been authenticated since the last call."""
-        bad = dict([ (index,p) for (index,p) in self._payloads.items() \
-                if self._verified_hashes.get(index, None) not in (None, p.hash()) ])
+        verified_hashes = self._verified_hashes
+        remaining = {}
+        ready = []
+        bad = []
+        for (index,p) in self._payloads.items():
+            vh = verified_hashes.get(index, None)
+            if vh is None:
+                remaining[index] = p
+            elif vh == p.hash():
+                ready.append((index,p))
+            else:
+                bad.append(index)
         for index in bad:
             print('ERROR: previously received payload %d does not match subsequently verified hash' % index)
-        ready = dict([ (index,p) for (index,p) in self._payloads.items() \
-                if self._verified_hashes.get(index, None) == p.hash() ])
-        self._payloads = dict([ (index,p) for (index,p) in self._payloads.items() \
-                if index not in ready and index not in bad ])
-        for (index,p) in sorted(ready.items()):
+        self._payloads = remaining
+        ready.sort(key=itemgetter(0))
+        for (index,p) in ready:
             yield p
 
-    def _extend_verification(self, payload):
-        """For a given authenticated payload, extend that authentication status
-        recursively to payloads whose hashes have been chained.
-        """
-        hlist = payload.auth_tag.chained_hashes
-        for src_index, ch in hlist:
-            if ch and src_index not in self._verified_hashes:
-                self._set_verified(src_index, ch)
-
     def _set_verified(self, index, hash_value):
         """Indicate that a given payload index has a given authenticated hash
         value. Further, attempt to propagate this authentication status through
         the graph of chained hashes if the payload itself is available.
         """
-        self._verified_hashes[index] = hash_value
-        if index > self._latest_verified_index:
-            self._latest_verified_index = index
-        if index in self._payloads:
-            if hash_value == self._payloads[index].hash():
-                self._extend_verification(self._payloads[index])
+        # Depth-first traversal of the chained hashes, using an explicit stack
+        # of partially-consumed chained hash iterators in place of recursion.
+        verified_hashes = self._verified_hashes
+        pending = []
+        while True:
+            verified_hashes[index] = hash_value
+            if index > self._latest_verified_index:
+                self._latest_verified_index = index
+            payload = self._payloads.get(index)
+            if payload is not None:
+                if hash_value == payload.hash():
+                    pending.append(payload.auth_tag.chained_hashes)
+                else:
+                    print('ERROR: previously received payload %d does not match newly verified hash' % index)
+            while pending:
+                for src_index, ch in pending[-1]:
+                    if ch and src_index not in verified_hashes:
+                        index, hash_value = src_index, ch
+                        break
+                else:
+                    pending.pop()
+                    continue
+                break
             else:
-                print('ERROR: previously received payload %d does not match newly verified hash' % index)
+                return
 
     def _expire_old_state(self):
         """Remove state outside the desired window."""
+        lo = self._latest_verified_index - self._pre_lv_window
+        hi = self._latest_verified_index + self._post_lv_window
         for index_dict in (self._payloads, self._verified_hashes):
-            delkeys = filter(lambda x: \
-                    x < self._latest_verified_index - self._pre_lv_window \
-                    or x > self._latest_verified_index + self._post_lv_window, \
-                    index_dict.keys())
-            for index in list(delkeys):
+            delkeys = [ index for index in index_dict if index < lo or index > hi ]
+            for index in delkeys:
                 index_dict.pop(index, None)
@@ -23,8 +23,11 @@
 
 from functools import total_ordering
 
-@total_ordering
 def IntMod(mod):
+    # Integer thresholds equivalent to comparing against 3*mod/4 and mod/4.
+    lt_min = -(-3 * mod // 4)
+    gt_max = mod // 4
+
     def __init__(self, value):
         self._value = int(value % mod)
 
@@ -38,9 +41,10 @@ def IntMod(mod):
 
     def __lt__(self, other):
         self._typecheck(other)
-        if (self.__int__() - int(other)) % mod >= 3 * mod / 4:
+        diff = (self._value - int(other)) % mod
+        if diff >= lt_min:
             return True
-        elif (self.__int__() - int(other)) % mod <= mod / 4:
+        elif diff <= gt_max:
             return False
         else:
             raise OverflowError()
@@ -38,14 +38,22 @@ from .payload import Payload
 from .truncated_hash import TruncatedHash
 
 import hashlib
-from functools import lru_cache
 
 TruncatedSHA256 = TruncatedHash(hashlib.sha256, trunc_octets=8)
 
+_sha256 = hashlib.sha256
+_sha256_trunc_octets = TruncatedSHA256.hash_size
+
+def _truncated_sha256_digest(value):
+    """Return TruncatedSHA256(value).digest() without the wrapper class."""
+    return _sha256(value).digest()[:_sha256_trunc_octets]
+
 class ModelAuthTag(AuthTagEO):
     """The model authentication tag, employing single-octet explicit offsets,
     SHA-256 hashes truncated to 8 octets, and an explicit 32-bit index.
     """
+    __slots__ = ('_index',)
+
     def __init__(self, index=None, signature_key=None, *args, **kwargs):
         """Initialize the model authentication tag.
 
@@ -67,9 +75,13 @@ class ModelAuthTag(AuthTagEO):
     def index(self, value):
         """Set the payload index to the given value."""
         self._index = value
+        self._to_str_cache = None
 
 class ModelPayload(Payload):
     """The model payload, employing the ModelAuthTag."""
+    __slots__ = ('_auth_tag', '_app_data', '_signature_valid', '_to_str',
+            '_to_str_tag', '_hash')
+
     def __init__(self, auth_tag):
         """Initialize the model payload.
 
@@ -79,6 +91,9 @@ class ModelPayload(Payload):
         self._auth_tag = auth_tag
         self._app_data = b''
         self._signature_valid = None
+        self._to_str = None
+        self._to_str_tag = None
+        self._hash = None
 
     @property
     def app_data(self):
@@ -89,18 +104,26 @@ class ModelPayload(Payload):
     def app_data(self, value):
         """Set the application data to the given value."""
         self._app_data = value
+        self._to_str = None
+        self._hash = None
 
     @property
     def auth_tag(self):
         """Return the enclosed authentication tag."""
         return self._auth_tag
 
-    @lru_cache(maxsize=100)
     def hash(self):
-        """Compute and return the hash of this payload."""
-        m = self.auth_tag.hash_cls()
-        m.update(self.to_str())
-        return m.digest()
+        """Compute and return the hash of this payload. The result is cached
+        along with the serialized payload (see to_str).
+        """
+        value = self.to_str()
+        if self._hash is None:
+            hash_cls = self.auth_tag.hash_cls
+            if hash_cls is TruncatedSHA256:
+                self._hash = _truncated_sha256_digest(value)
+            else:
+                self._hash = hash_cls(value).digest()
+        return self._hash
 
     @property
     def index(self):
@@ -114,16 +137,23 @@ class ModelPayload(Payload):
         """True iff a signature is present and valid."""
         return self._signature_valid
 
-    @lru_cache(maxsize=100)
     def to_str(self):
         """Serialize the payload. If the authentication tag indicates the
         payload is to be signed, sign the result. Return the serialized
-        payload."""
-        pre_sig = b'%s%s' % (self.auth_tag.to_str(), self._app_data)
-        if self.auth_tag.options.signature_present:
-            return self.auth_tag.sign(pre_sig)
-        else:
-            return pre_sig
+        payload, which is cached until the application data or the
+        authentication tag is next modified."""
+        # The authentication tag caches its own serialization and discards it
+        # on modification, so a new tag serialization means a modified tag.
+        tag_str = self._auth_tag.to_str()
+        if self._to_str is None or tag_str is not self._to_str_tag:
+            pre_sig = b''.join((tag_str, self._app_data))
+            if self._auth_tag.options.signature_present:
+                self._to_str = self._auth_tag.sign(pre_sig)
+            else:
+                self._to_str = pre_sig
+            self._to_str_tag = tag_str
+            self._hash = None
+        return self._to_str
 
     @classmethod
     def from_str(cls, value, signature_key=None):
@@ -28,6 +28,8 @@ from abc import ABCMeta, abstractmethod
 
 class Payload(metaclass=ABCMeta):
     """Derive (or duck-type) to define a payload class."""
+    __slots__ = ()
+
     @abstractmethod
     def hash(self):
         """Abstract method that must be defined to return the hash of the
@@ -29,15 +29,19 @@ authentication tag have been computed.
 
 from .common import *
 
+from collections import deque
+
 class Producer:
     """A payload producer. Add payloads to be sent using push_payload. Once a
     payload's authentication tag is complete, the payloads to be sent will be
     generated by payloads_ready.
     """
+    __slots__ = ('_scheme', '_stream', '_hashes', '_next_index', '_last_index')
+
     def __init__(self, scheme):
         """Initialize state with the given scheme."""
         self._scheme = scheme
-        self._stream = []
+        self._stream = deque()
         self._hashes = {}
         self._next_index = 0
         self._last_index = None
@@ -69,7 +73,7 @@ class Producer:
                 # This is an error condition: the scheme thinks we're ready but
                 # we're missing a chained hash somewhere. Bomb.
                 raise SchemeError() from v
-            self._stream.pop(0)
+            self._stream.popleft()
             yield p
         self._expire_old_state()
 
@@ -117,13 +121,17 @@ class Producer:
         """Return the hash of the payload with the given index. Throw Pending
         if it cannot yet be computed."""
         p = self._get_payload(index)
+        auth_tag = p.auth_tag
         incomplete = False
+        ready = []
         for src_index in self._scheme.sources(index, 0, self._last_index):
-            if not p.auth_tag.get_chained_hash(src_index):
+            if src_index not in auth_tag:
                 try:
-                    p.auth_tag.chain_payload_hash(src_index, self._payload_hash(src_index))
+                    ready.append((src_index, self._payload_hash(src_index)))
                 except Pending:
                     incomplete = True
+        if ready:
+            auth_tag.chain_payload_hashes(ready)
         if incomplete:
             raise Pending()
         return p.hash()
@@ -133,8 +141,9 @@ class Producer:
         index is out of range.
         """
         try:
-            if self._earliest_index() <= index <= self._latest_index():
-                return self._stream[index - self._earliest_index()]
+            earliest = self._earliest_index()
+            if earliest <= index <= self._latest_index():
+                return self._stream[index - earliest]
             else:
                 raise IndexError()
         except OutOfRange as v:
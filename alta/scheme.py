@@ -26,42 +26,38 @@
 Golle/Modadugu (2001).
 """
 
-from abc import ABCMeta, abstractmethod
-
-class Scheme(metaclass=ABCMeta):
+class Scheme:
     """A scheme for defining a DAG of payload hashes."""
-    @abstractmethod
+    __slots__ = ()
+
     def sources(self, seqno, start=None, end=None):
         """An abstract method that must be defined to return the list of
         indices of nodes from which hashes must be drawn for insertion into the
         given node's authentication tag. If first or last is specified,
         eliminate any node indices outside of that range.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def destinations(self, seqno, start=None, end=None):
         """An abstract method that must be defined to return the list of
         indices of nodes into which a given node's hash must be placed. If
         first or last is specified, eliminate any node indices outside of that
         range.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def is_ready(self, want_send_seqno, latest_seqno):
         """An abstract method that must be defined to be true if all payload
         hashes required to fully construct the payload with index
         want_send_idex must be available. Note that this requires payloads to
         be constructed in-order.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def in_write_window(self, query_seqno, latest_seqno):
         """An abstract method that must be defined to be true if the hash of
         the payload with the given query_index may still be required to
         construct payloads from latest_index onward. Note that this requires
         payloads to be constructed in-order.
         """
-        pass
+        raise NotImplementedError
@@ -22,47 +22,49 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-"""This module defines key types based on the nacl key interfaces, augmented
+"""This module defines key types derived from the nacl key types, augmented
 with an explicit attribute indicating the fixed signature length.
 """
 
 import nacl.signing
 
 def SignatureKeyTypes(skey_type, vkey_type, signature_len):
-    """Return a tuple (signing key type, verification key type) augmented with
-    the specified fixed signature_len. skey_type and vkey_type must conform to
-    the nacl.signing.{SigningKey,VerifyKey} interface.
+    """Return a tuple (signing key type, verification key type) subclassing
+    skey_type and vkey_type, augmented with the specified fixed signature_len.
+    skey_type and vkey_type must conform to the
+    nacl.signing.{SigningKey,VerifyKey} interface; in particular, a signing key
+    must set its verify_key attribute on construction. The returned signing
+    type converts that attribute to the returned verification type once, when
+    the key is constructed, so accessing it allocates nothing.
     """
-    skey_wrapper_type = None
-    vkey_wrapper_type = None
+    def __init__(self, *args, **kwargs):
+        skey_type.__init__(self, *args, **kwargs)
+        # Convert the verify key so that it carries signature_len as well.
+        self.verify_key = vkey_subtype(bytes(self.verify_key))
 
-    def mk_init(key_type):
-        def __init__(self, *args, **kwargs):
-            """If _import is specified as a keyword argument, its value is used
-            as the key; otherwise, a new key is constructed with the given
-            arguments.
-            """
-            if '_import' in kwargs:
-                self._key = kwargs['_import']
-            else:
-                self._key = key_type(*args, **kwargs)
-        return __init__
+    def sign_many(self, messages):
+        """Sign each message in the given iterable with this key, returning the
+        list of signed messages in the same order.
+        """
+        # nacl provides no batched signing; reusing the one bound sign method
+        # is the cheapest loop available. This is the place to substitute a
+        # batched backend.
+        sign = self.sign
+        return [ sign(message) for message in messages ]
 
-    def __getattr__(self, name):
-        return getattr(self._key, name)
+    def verify_batch(items):
+        """Static method to verify each (verification key, message,
+        signature) tuple in the given iterable, throwing if any signature
+        fails verification. The keys need not be distinct.
+        """
+        # nacl provides no batched verification, so verify one at a time. This
+        # is the place to substitute a batched backend.
+        for vkey, message, signature in items:
+            vkey.verify(message, signature)
 
-    @property
-    def verify_key(self):
-        """Return the corresponding verify key for this signing key."""
-        return vkey_wrapper_type(_import=self._key.verify_key)
+    skey_subtype = type(skey_type.__name__, (skey_type,), dict( __init__=__init__, sign_many=sign_many, signature_len=signature_len ))
+    vkey_subtype = type(vkey_type.__name__, (vkey_type,), dict( verify_batch=staticmethod(verify_batch), signature_len=signature_len ))
 
-    def generate(*args, **kwargs):
-        """Class method to generate and return a new signing key."""
-        return skey_wrapper_type(_import=skey_type.generate(*args, **kwargs))
-
-    skey_wrapper_type = type(skey_type.__name__, (), dict( __init__=mk_init(skey_type), __getattr__=__getattr__, generate=generate, verify_key=verify_key, signature_len=signature_len ))
-    vkey_wrapper_type = type(vkey_type.__name__, (), dict( __init__=mk_init(vkey_type), __getattr__=__getattr__, signature_len=signature_len ))
-
-    return skey_wrapper_type, vkey_wrapper_type
+    return skey_subtype, vkey_subtype
 
 Ed25519SigningKey, Ed25519VerifyKey = SignatureKeyTypes(nacl.signing.SigningKey, nacl.signing.VerifyKey, 64)
@@ -24,24 +24,62 @@
 
 """This module provides a hash truncated to a given number of octets."""
 
-import binascii
+import hashlib
 
 def TruncatedHash(hash_ctor, trunc_octets):
     """Return a new hash type derived from the given hash_ctor type, truncated
-    to the given number of octets.
+    to the given number of octets. The type carries a hash_size class
+    attribute equal to trunc_octets.
     """
     def __init__(self, *args, **kwargs):
-        self._hstate = hash_ctor(*args, **kwargs)
+        self._set_hstate(hash_ctor(*args, **kwargs))
+
+    def _set_hstate(self, hstate):
+        # Bind the hot methods of the underlying hash state directly on the
+        # instance, so that calling them does not fall back to __getattr__.
+        self._hstate = hstate
+        self._digest = hstate.digest
+        self.update = hstate.update
 
     def __getattr__(self, name):
         return getattr(self._hstate, name)
 
-    def hexdigest(self):
-        """Return a hex encoding of the truncated digest."""
-        return binascii.hexlify(self.digest())
+    def copy(self):
+        """Return a copy of this truncated hash state."""
+        ret = type(self).__new__(type(self))
+        ret._set_hstate(self._hstate.copy())
+        return ret
+
+    # Variable-length hashes such as SHAKE produce exactly trunc_octets
+    # octets directly, rather than via a full-length digest and a slice.
+    try:
+        hash_ctor().digest(trunc_octets)
+        variable_length = True
+    except TypeError:
+        variable_length = False
+
+    if variable_length:
+        def digest(self):
+            """Return the truncated digest."""
+            return self._digest(trunc_octets)
 
-    def digest(self):
-        """Return the truncated digest."""
-        return self._hstate.digest()[0:trunc_octets]
+        def hexdigest(self):
+            """Return a hex encoding of the truncated digest."""
+            return self._digest(trunc_octets).hex()
+    else:
+        def digest(self):
+            """Return the truncated digest."""
+            return self._digest()[0:trunc_octets]
 
-    return type('Truncated%s' % hash_ctor.__name__.capitalize(), (), dict( __init__=__init__, __getattr__=__getattr__, digest=digest, hexdigest=hexdigest, hash_size=trunc_octets ))
+        def hexdigest(self):
+            """Return a hex encoding of the truncated digest."""
+            return self._digest()[0:trunc_octets].hex()
+
+    return type('Truncated%s' % hash_ctor.__name__.capitalize(), (), dict( __init__=__init__, _set_hstate=_set_hstate, __getattr__=__getattr__, copy=copy, digest=digest, hexdigest=hexdigest, hash_size=trunc_octets ))
+
+def ShakeTruncatedHash(trunc_octets, hash_ctor=hashlib.shake_128):
+    """Return a new hash type producing digests of the given number of octets
+    directly from the given SHAKE hash_ctor (by default, SHAKE128), with no
+    full-length digest to truncate.
+    """
+    return TruncatedHash(hash_ctor, trunc_octets)
@@ -24,24 +24,24 @@
 
 from alta.model_payload import ModelPayload
 
-from binascii import hexlify
-
 p0 = ModelPayload.new_by_index(0)
 p0.app_data = b'p0'
 p1 = ModelPayload.new_by_index(1)
 p1.app_data = b'p1'
 p2 = ModelPayload.new_by_index(2)
 p2.app_data = b'p2'
-p0.auth_tag.chain_payload_hash(p1.index, p1.hash())
-p2.auth_tag.chain_payload_hash(p0.index, p0.hash())
-p2.auth_tag.chain_payload_hash(p1.index, p1.hash())
-print('p0: %s' % hexlify(p0.hash()))
-print('p1: %s' % hexlify(p1.hash()))
-print('p2: %s' % hexlify(p2.hash()))
+h1 = p1.hash()
+p0.auth_tag.chain_payload_hash(p1.index, h1)
+h0 = p0.hash()
+p2.auth_tag.chain_payload_hashes([(p0.index, h0), (p1.index, h1)])
+h2 = p2.hash()
+print('p0: %s' % h0.hex())
+print('p1: %s' % h1.hex())
+print('p2: %s' % h2.hex())
 
 p2str = p2.to_str()
-print('p2str: %s (%d) %s' % (hexlify(p2str), len(p2str), p2str))
+print('p2str: %s (%d) %s' % (p2str.hex(), len(p2str), p2str))
 c2, used = ModelPayload.from_str(p2str)
 c2str = c2.to_str()
-print('c2str: %s (%d) %s' % (hexlify(c2str), len(c2str), c2str))
-print('c2: %s (%d used)' % (hexlify(c2.hash()), used))
+print('c2str: %s (%d) %s' % (c2str.hex(), len(c2str), c2str))
+print('c2: %s (%d used)' % (c2.hash().hex(), used))
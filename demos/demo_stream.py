@@ -28,7 +28,9 @@ from alta.model_payload import ModelPayload
 from alta.producer import Producer
 from alta.consumer import ConsumerEO
 from alta.signature import Ed25519SigningKey
-from binascii import hexlify
+
+# Per-payload tracing is suppressed with -q, e.g. when benchmarking
+VERBOSE = '-q' not in sys.argv[1:]
 
 # Generate an Ed25519 key pair
 skey = Ed25519SigningKey.generate()
@@ -47,8 +49,16 @@ loss_burst_max = p
 signature_stride = a*p
 seq_length = 151
 
+# The maximum tag length depends only on the index modulo the scheme period
+# and on whether the payload is signed, so build each padding string once
+_padding = {}
+
 def _test_payload(payload):
-    return b'%04d %s' % (payload.index, b'.' * (1472-5-payload.auth_tag.max_len(s)))
+    key = (payload.index % s.p, payload.auth_tag.signature_key is not None)
+    pad = _padding.get(key)
+    if pad is None:
+        pad = _padding[key] = b'.' * (1472-5-payload.auth_tag.max_len(s))
+    return b'%04d %s' % (payload.index, pad)
 
 last_index = seq_length - 1
 inp_seq = [ PayloadType.new_by_index(index=i, signature_key=skey if i == last_index or (i % signature_stride) == 0 else None) for i in range(0,seq_length) ] + [ None ]
@@ -60,13 +70,34 @@ sent = 0
 received = 0
 delivered = 0
 
-left_to_drop = 0
+from random import choices, randint
+
+def _loss_pattern(n):
+    """Return a list of n drop decisions, in which each payload not already
+    being dropped starts a loss burst with probability loss_pct percent.
+    """
+    drops = []
+    left_to_drop = 0
+    # Draw all of the loss trials in one call rather than one per payload
+    for trial in choices(range(1,101), k=n):
+        if left_to_drop > 0:
+            left_to_drop -= 1
+            drops.append(True)
+        elif trial <= loss_pct:
+            left_to_drop = randint(1,loss_burst_max-1)
+            drops.append(True)
+        else:
+            drops.append(False)
+    return drops
+
+DROPS = _loss_pattern(seq_length)
 
-from random import randint
+# The scheme and stream bounds are fixed, so look up each payload's sources
+# once up front rather than on every trace line
+SOURCES = [ tuple(s.sources(i, 0, last_index)) for i in range(seq_length) ]
 
 def _src_indices(payload):
-    index = payload.index
-    return ','.join([ str(x) for x in s.sources(index, 0, last_index)])
+    return ','.join(map(str, SOURCES[payload.index]))
 
 for i,src_payload in enumerate(inp_seq):
     if src_payload:
@@ -76,21 +107,21 @@ for i,src_payload in enumerate(inp_seq):
         ps.shutdown()
 
     for send_payload in ps.payloads_ready():
-        print('s iter %d idx %d %s %s %d/%d %s %s' % (i, send_payload.index, hexlify(send_payload.hash()), send_payload.app_data[0:8], len(send_payload.app_data), len(send_payload.to_str()), ' VERIFIED' if send_payload.auth_tag.signature_key else '', _src_indices(send_payload)))
-        drop = left_to_drop > 0 or randint(1,100) <= loss_pct
-        if drop:
-            if left_to_drop > 0:
-                left_to_drop -= 1
-            else:
-                left_to_drop = randint(1,loss_burst_max-1)
-            print('- %d' % (send_payload.index))
+        sbytes = send_payload.to_str()
+        if VERBOSE:
+            print('s iter %d idx %d %s %s %d/%d %s %s' % (i, send_payload.index, send_payload.hash().hex(), send_payload.app_data[0:8], len(send_payload.app_data), len(sbytes), ' VERIFIED' if send_payload.auth_tag.signature_key else '', _src_indices(send_payload)))
+        if DROPS[send_payload.index]:
+            if VERBOSE:
+                print('- %d' % (send_payload.index))
         else:
-            recv_payload, used = PayloadType.from_str(send_payload.to_str(), signature_key=vkey)
+            recv_payload, used = PayloadType.from_str(sbytes, signature_key=vkey)
             cs.push_payload(recv_payload)
-            print('r iter %d idx %d %s %s %d/%d %s' % (i, recv_payload.index, hexlify(recv_payload.hash()), recv_payload.app_data[0:8], len(recv_payload.app_data), len(recv_payload.to_str()), ' VERIFIED' if recv_payload.signature_valid else ''))
+            if VERBOSE:
+                print('r iter %d idx %d %s %s %d/%d %s' % (i, recv_payload.index, recv_payload.hash().hex(), recv_payload.app_data[0:8], len(recv_payload.app_data), len(recv_payload.to_str()), ' VERIFIED' if recv_payload.signature_valid else ''))
             received += 1
         for recv_payload in cs.payloads_ready():
             delivered += 1
-            print('d iter %d idx %d %s' % (i, recv_payload.index, hexlify(recv_payload.hash())))
+            if VERBOSE:
+                print('d iter %d idx %d %s' % (i, recv_payload.index, recv_payload.hash().hex()))
 
 print('\nsent: %d  received: %d  delivered: %d' % (sent, received, delivered))
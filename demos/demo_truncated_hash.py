@@ -22,12 +22,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from alta.truncated_hash import TruncatedHash
-
-import sys
-from binascii import hexlify
+from alta.truncated_hash import TruncatedHash, ShakeTruncatedHash
 from hashlib import sha256
 
 TruncatedSHA256 = TruncatedHash(sha256, trunc_octets=8)
 c2 = TruncatedSHA256(b'')
 print('c2: %s' % c2.hexdigest())
+
+TruncatedShake128 = ShakeTruncatedHash(trunc_octets=8)
+c3 = TruncatedShake128(b'')
+print('c3: %s' % c3.hexdigest())